@@ -1,21 +1,58 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, send_file
+from flask import Flask, Response, render_template, request, redirect, url_for, flash, stream_with_context
 import s3_utils
 import os
 import json
+import copy
+import hashlib
+import sys
 from werkzeug.utils import secure_filename 
 import threading
 import time
 import logging
+import unicodedata
+from urllib.parse import quote
+import queue
+from concurrent.futures import ThreadPoolExecutor
 import requests
-from botocore.exceptions import ClientError
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from botocore.exceptions import BotoCoreError, ClientError
 
 # --- Global Configuration ---
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024 # Bytes read from S3 per chunk when streaming downloads
+
 app = Flask(__name__)
 app.secret_key = os.urandom(24)
+
+def _env_int(name, default):
+    """Reads an integer environment variable, falling back to default if it is unset or invalid."""
+    value = os.getenv(name)
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        app.logger.warning(f"Ignoring invalid {name}={value!r}; using {default}")
+        return default
+
+# Optional cap on request size in bytes; unlimited unless set
+app.config['MAX_CONTENT_LENGTH'] = _env_int('MAX_CONTENT_LENGTH', None)
 CONFIG_DIR = '/data/config'
 POLLING_CONFIG_FILE = os.path.join(CONFIG_DIR, 'polling_config.json')
 S3_CONFIG_FILE = os.path.join(CONFIG_DIR, 's3_config.json')
-LOG_HEARTBEAT_INTERVAL = 30 # Number of loops before logging a heartbeat (30 loops * 10s = 5 mins)
+LOG_HEARTBEAT_INTERVAL = 300 # Seconds between heartbeat log lines (5 mins)
+# Per-bucket poll interval bounds (seconds). Quiet buckets back off, busy ones speed up.
+POLL_MIN_INTERVAL = 5
+POLL_START_INTERVAL = 10
+POLL_MAX_INTERVAL = 300
+POLL_BACKOFF = 1.5
+WEBHOOK_WORKERS = 4 # Threads delivering queued webhook notifications
+WEBHOOK_MAX_BATCH = max(1, _env_int('WEBHOOK_MAX_BATCH', 500)) # Max events per webhook POST (at least 1)
+BUCKET_SCAN_WORKERS = 8 # Buckets listed concurrently per polling cycle; must fit s3_utils.CALLER_CONNECTIONS
+# Large buckets are listed in parallel key ranges split at keys from the previous scan
+LIST_KEYS_PER_SHARD = 5000 # Target keys per range (5 pages)
+MAX_LIST_SHARDS = 8
+LIST_SHARD_WORKERS = 16 # Key ranges listed at once across all scans; must fit s3_utils.CALLER_CONNECTIONS
 
 # --- Polling Logic (Now part of the main app) ---
 # Set logging level for the poller
@@ -25,42 +62,184 @@ poller_logger.setLevel(logging.INFO)
 app.logger.setLevel(logging.INFO) 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - [%(name)s] - %(levelname)s - %(message)s')
 
-
-def get_bucket_state(s3_client, bucket_name):
-    """Scans a bucket and returns a dictionary of {object_key: ETag}."""
-    state = {}
+# Scans and their shards get separate pools so a scan waiting on its shards never
+# holds the threads they need, and neither queues behind s3_utils.executor work
+# such as delete_folder batches.
+bucket_executor = ThreadPoolExecutor(max_workers=BUCKET_SCAN_WORKERS, thread_name_prefix='BucketScan')
+shard_executor = ThreadPoolExecutor(max_workers=LIST_SHARD_WORKERS, thread_name_prefix='ListShard')
+
+# Webhook posts are queued by the poller and sent by notification_worker threads.
+# Each webhook URL always maps to the same queue and worker, so its payloads are
+# posted in the order they were queued.
+notification_queues = [queue.Queue(maxsize=10000 // WEBHOOK_WORKERS) for _ in range(WEBHOOK_WORKERS)]
+_webhook_session = requests.Session()
+# Pooled keep-alive connections avoid a new TCP/TLS handshake per notification
+_webhook_adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32,
+                               max_retries=Retry(total=2, backoff_factor=0.2))
+_webhook_session.mount('http://', _webhook_adapter)
+_webhook_session.mount('https://', _webhook_adapter)
+
+
+def _list_key_range(s3_client, bucket_name, start_after, end_at):
+    """Lists (key, ETag) pairs with start_after < key <= end_at; end_at=None is unbounded."""
+    entries = []
+    paginator = s3_client.get_paginator('list_objects_v2')
+    for page in paginator.paginate(Bucket=bucket_name, StartAfter=start_after):
+        for obj in page.get('Contents', []):
+            if end_at is not None and obj['Key'] > end_at:
+                return entries
+            entries.append((obj['Key'], obj['ETag']))
+    return entries
+
+def _etag_fingerprint(etag):
+    return int.from_bytes(hashlib.blake2b(etag.encode(), digest_size=8).digest(), 'little')
+
+def shard_split_points(state):
+    """Picks evenly spaced keys from a known bucket state as split points for its next scan.
+
+    The state is built in listing order, so its keys are already sorted.
+    """
+    shards = min(MAX_LIST_SHARDS, len(state) // LIST_KEYS_PER_SHARD)
+    if shards < 2:
+        return []
+    keys = list(state)
+    step = len(keys) // shards
+    return [keys[i * step] for i in range(1, shards)]
+
+def get_bucket_state(s3_client, bucket_name, known_digest=None, split_points=(), list_etag=None):
+    """Scans a bucket and returns ({object_key: ETag fingerprint}, digest, list_etag).
+
+    split_points are sorted keys used to list a large bucket in parallel ranges.
+    The digest is a hash over every (key, ETag) pair. If it equals known_digest,
+    the bucket is unchanged and (None, digest, list_etag) is returned without
+    building the dictionary; the same happens when a list_etag from the previous
+    scan is answered with 304. The returned list_etag is the listing ETag to send
+    next time, or None if the backend sent none. On a listing error,
+    (None, None, None) is returned.
+
+    Runs on a worker thread, so it never touches the poller's per-bucket records;
+    the caller stores the returned digest and list_etag when it applies the result.
+    """
     try:
-        paginator = s3_client.get_paginator('list_objects_v2')
-        pages = paginator.paginate(Bucket=bucket_name)
-        for page in pages:
-            if 'Contents' in page:
-                for obj in page['Contents']:
-                    state[obj['Key']] = obj['ETag']
-    except ClientError as e:
+        if known_digest is None:
+            list_etag = None
+        first_page = s3_utils.list_objects_v2_if_changed(s3_client, list_etag, Bucket=bucket_name)
+        if first_page is None:
+            return None, known_digest, list_etag
+
+        # Only single-page listings qualify for a conditional request next time,
+        # so a 304 always covers every key.
+        list_etag = first_page.get('ResponseMetadata', {}).get('HTTPHeaders', {}).get('etag')
+        if first_page.get('IsTruncated'):
+            list_etag = None
+
+        chunks = [[(obj['Key'], obj['ETag']) for obj in first_page.get('Contents', [])]]
+
+        # Small buckets fit in one page. For larger ones, split the remaining
+        # key space at split_points (keys from the previous scan, see
+        # shard_split_points) into disjoint ranges and list them in parallel.
+        if first_page.get('IsTruncated'):
+            last_key = chunks[0][-1][0]
+            bounds = [last_key] + [k for k in split_points if k > last_key] + [None]
+            futures = [
+                shard_executor.submit(_list_key_range, s3_client, bucket_name, start, end)
+                for start, end in zip(bounds, bounds[1:])
+            ]
+            chunks.extend(future.result() for future in futures)
+    except (ClientError, BotoCoreError) as e:
         poller_logger.error(f"Error listing objects in bucket '{bucket_name}': {e}")
-    return state
+        return None, None, None
+
+    h = hashlib.blake2b(digest_size=16)
+    for chunk in chunks:
+        for key, etag in chunk:
+            h.update(key.encode())
+            h.update(b'\0')
+            h.update(etag.encode())
+            h.update(b'\n')
+    digest = h.digest()
+    if digest == known_digest:
+        return None, digest, list_etag
+
+    # Keys are interned so consecutive states share key objects, and ETags are
+    # stored as 64-bit ints rather than ~35-char strings.
+    state = {}
+    for chunk in chunks:
+        for key, etag in chunk:
+            state[sys.intern(key)] = _etag_fingerprint(etag)
+    return state, digest, list_etag
 
-def send_notification(webhook_url, event_type, bucket_name, object_key):
-    """Sends a notification payload to the configured webhook URL."""
-    payload = {
+def _scan_result(scan, bucket_name):
+    """Returns a bucket scan's result, or (None, None, None) if it failed, so one bucket can't abort the cycle."""
+    try:
+        return scan.result()
+    except Exception as e:
+        poller_logger.error(f"Error scanning bucket '{bucket_name}': {e}", exc_info=True)
+        return None, None, None
+
+def diff_states(previous_state, current_state):
+    """Returns (created_or_modified, deleted) key lists between two bucket states."""
+    cur_keys = current_state.keys()
+    prev_keys = previous_state.keys()
+    modified = {k for k in cur_keys & prev_keys if current_state[k] != previous_state[k]}
+    return sorted((cur_keys - prev_keys) | modified), sorted(prev_keys - cur_keys)
+
+def make_event(event_type, bucket_name, object_key):
+    """Builds a single notification payload."""
+    return {
         'event_type': event_type,
         'bucket': bucket_name,
         'object_key': object_key,
         'timestamp': time.time()
     }
-    try:
-        response = requests.post(webhook_url, json=payload, timeout=10)
-        response.raise_for_status()
-        # This is now the primary log for detected changes
-        poller_logger.info(f"🚀 Sent notification for {event_type}: {object_key} to {webhook_url}")
-    except requests.exceptions.RequestException as e:
-        poller_logger.error(f"Failed to send webhook notification for {object_key}. Error: {e}")
+
+def send_batch(webhook_url, events):
+    """Queues events for delivery to the configured webhook URL.
+
+    Events are split into POSTs of at most WEBHOOK_MAX_BATCH events. A batch
+    holding one event is sent as that event's payload; larger batches are sent
+    as {'events': [...]}. No deduplication is done: diff_states already yields
+    each key at most once per event type.
+    """
+    for i in range(0, len(events), WEBHOOK_MAX_BATCH):
+        batch = events[i:i + WEBHOOK_MAX_BATCH]
+        body = batch[0] if len(batch) == 1 else {'events': batch}
+        try:
+            _queue_for(webhook_url).put_nowait((webhook_url, body))
+        except queue.Full:
+            poller_logger.error(f"Notification queue is full. Dropped {len(batch)} notification(s) for {webhook_url}.")
+
+def _queue_for(webhook_url):
+    return notification_queues[hash(webhook_url) % WEBHOOK_WORKERS]
+
+def notification_worker(work_queue):
+    """Drains one notification queue, posting each payload to its webhook in order."""
+    while True:
+        webhook_url, body = work_queue.get()
+        events = body.get('events', [body])
+        try:
+            response = _webhook_session.post(webhook_url, json=body, timeout=10)
+            response.raise_for_status()
+            # This is now the primary log for detected changes
+            for event in events:
+                poller_logger.info(f"🚀 Sent notification for {event['event_type']}: {event['object_key']} to {webhook_url}")
+        except requests.exceptions.RequestException as e:
+            poller_logger.error(f"Failed to send {len(events)} notification(s) to {webhook_url}. Error: {e}")
+            for event in events:
+                poller_logger.error(f"Unsent notification for {event['event_type']}: {event['object_key']}")
+        finally:
+            work_queue.task_done()
 
 def poller_background_thread():
     """The main loop that polls all configured buckets."""
     s3_client = None
     known_states = {}
-    loop_count = 0
+    known_hashes = {}
+    known_splits = {}
+    known_list_etags = {}
+    intervals = {}
+    next_check_at = {}
+    last_heartbeat = time.time()
     
     poller_logger.info("Polling thread started. Waiting for S3 configuration...")
     
@@ -72,55 +251,81 @@ def poller_background_thread():
     poller_logger.info("S3 client initialized in poller. Starting main polling loop...")
     while True:
         try:
-            loop_count += 1
-            if not os.path.exists(POLLING_CONFIG_FILE):
-                time.sleep(10)
-                continue
-            
-            with open(POLLING_CONFIG_FILE, 'r') as f:
-                polling_config = json.load(f)
+            # Cheap when unchanged; picks up a new client after /configure.
+            s3_client = s3_utils.get_s3_client()[0] or s3_client
+            polling_config = current_polling_config()
 
             active_buckets = {b for b, c in polling_config.items() if c.get('enabled')}
             
-            if loop_count % LOG_HEARTBEAT_INTERVAL == 0:
+            if time.time() - last_heartbeat >= LOG_HEARTBEAT_INTERVAL:
                 poller_logger.info(f"Polling {len(active_buckets)} active bucket(s). Heartbeat...")
-                loop_count = 0 # Reset counter
+                last_heartbeat = time.time()
 
-            for bucket_name in list(known_states.keys()):
+            for bucket_name in list(next_check_at.keys()):
                 if bucket_name not in active_buckets:
-                    del known_states[bucket_name]
+                    known_states.pop(bucket_name, None)
+                    known_hashes.pop(bucket_name, None)
+                    known_splits.pop(bucket_name, None)
+                    known_list_etags.pop(bucket_name, None)
+                    intervals.pop(bucket_name, None)
+                    del next_check_at[bucket_name]
                     poller_logger.info(f"Stopped monitoring bucket '{bucket_name}'.")
 
-            for bucket_name, config in polling_config.items():
-                if not config.get('enabled'):
-                    continue
-
-                webhook_url = config['webhook_url']
+            # List every due bucket concurrently; results are applied below on this thread
+            now = time.time()
+            due_buckets = [b for b in active_buckets if next_check_at.get(b, 0) <= now]
+            scans = {
+                b: bucket_executor.submit(get_bucket_state, s3_client, b, known_hashes.get(b),
+                                          known_splits.get(b, ()), known_list_etags.get(b))
+                for b in due_buckets
+            }
+
+            for bucket_name in due_buckets:
+                webhook_url = polling_config[bucket_name]['webhook_url']
                 
                 if bucket_name not in known_states:
-                    known_states[bucket_name] = get_bucket_state(s3_client, bucket_name)
-                    poller_logger.info(f"Now monitoring bucket '{bucket_name}'. Initial state has {len(known_states[bucket_name])} objects.")
+                    intervals[bucket_name] = POLL_START_INTERVAL
+                    next_check_at[bucket_name] = time.time() + POLL_START_INTERVAL
+                    state, digest, list_etag = _scan_result(scans[bucket_name], bucket_name)
+                    if state is None:
+                        continue
+                    known_states[bucket_name] = state
+                    known_hashes[bucket_name] = digest
+                    known_list_etags[bucket_name] = list_etag
+                    known_splits[bucket_name] = shard_split_points(state)
+                    poller_logger.info(f"Now monitoring bucket '{bucket_name}'. Initial state has {len(state)} objects.")
                     continue
 
-                current_state = get_bucket_state(s3_client, bucket_name)
+                # Only diff when the hash over (key, ETag) pairs has changed
+                current_state, digest, list_etag = _scan_result(scans[bucket_name], bucket_name)
+                if current_state is None:
+                    if digest is not None:
+                        # Unchanged: back off before checking this bucket again
+                        known_list_etags[bucket_name] = list_etag
+                        intervals[bucket_name] = min(intervals[bucket_name] * POLL_BACKOFF, POLL_MAX_INTERVAL)
+                    next_check_at[bucket_name] = time.time() + intervals[bucket_name]
+                    continue
                 previous_state = known_states[bucket_name]
 
-                # Compare states and send notifications (logging is now in send_notification)
-                for key, etag in current_state.items():
-                    if key not in previous_state or previous_state[key] != etag:
-                        send_notification(webhook_url, 'OBJECT_CREATED', bucket_name, key)
-
-                for key in previous_state:
-                    if key not in current_state:
-                        send_notification(webhook_url, 'OBJECT_DELETED', bucket_name, key)
+                # Compare states and queue notifications (logging is now in notification_worker)
+                created, deleted = diff_states(previous_state, current_state)
+                to_send = [make_event('OBJECT_CREATED', bucket_name, key) for key in created]
+                to_send.extend(make_event('OBJECT_DELETED', bucket_name, key) for key in deleted)
+                send_batch(webhook_url, to_send)
                 
                 known_states[bucket_name] = current_state
+                known_hashes[bucket_name] = digest
+                known_list_etags[bucket_name] = list_etag
+                known_splits[bucket_name] = shard_split_points(current_state)
+                intervals[bucket_name] = POLL_MIN_INTERVAL
+                next_check_at[bucket_name] = time.time() + POLL_MIN_INTERVAL
             
-            time.sleep(10)
+            # Sleep until the next bucket is due, but wake at least every
+            # POLL_START_INTERVAL so newly enabled buckets are picked up promptly.
+            due = [next_check_at[b] for b in active_buckets if b in next_check_at]
+            wait = min(due) - time.time() if due else POLL_START_INTERVAL
+            time.sleep(max(0.5, min(wait, POLL_START_INTERVAL)))
 
-        except (IOError, json.JSONDecodeError):
-            poller_logger.warning("Polling config file not found or is invalid. Retrying...")
-            time.sleep(15)
         except Exception as e:
             poller_logger.error(f"An error occurred in the polling loop: {e}", exc_info=True)
             time.sleep(60)
@@ -130,30 +335,50 @@ def poller_background_thread():
 def kb_format(value):
     """Converts bytes to a formatted KB string."""
     try:
-        kb = int(value) / 1024
-        if kb < 0.1:
-            return f"{kb:.3f} KB"
-        return f"{kb:,.2f} KB"
+        # S3 sizes are already ints, so skip the int() conversion for them
+        kb = value / 1024 if isinstance(value, (int, float)) else int(value) / 1024
     except (ValueError, TypeError):
         return "--"
+    if kb < 0.1:
+        return f"{kb:.3f} KB"
+    return format(kb, ',.2f') + " KB"
 
 # --- Flask Routes ---
-def load_polling_config():
-    """Loads the polling configuration from its JSON file."""
+# In-memory copy of the polling config shared by the routes and the poller thread.
+# It is read from disk once and replaced wholesale on every save, so readers never
+# touch the file and a dict handed out by current_polling_config() never changes.
+_polling_config = {"loaded": False, "data": {}}
+_polling_config_lock = threading.Lock()
+
+def _read_polling_config_file():
     if not os.path.exists(POLLING_CONFIG_FILE):
         return {}
     try:
         with open(POLLING_CONFIG_FILE, 'r') as f:
             return json.load(f)
     except (IOError, json.JSONDecodeError):
+        app.logger.warning("Polling config file could not be read. Starting with an empty configuration.")
         return {}
 
+def current_polling_config():
+    """Returns the shared polling configuration. Callers must not modify it."""
+    with _polling_config_lock:
+        if not _polling_config["loaded"]:
+            _polling_config.update(loaded=True, data=_read_polling_config_file())
+        return _polling_config["data"]
+
+def load_polling_config():
+    """Returns a copy of the polling configuration for editing."""
+    return copy.deepcopy(current_polling_config())
+
 def save_polling_config(config):
-    """Saves the polling configuration to its JSON file."""
+    """Saves the polling configuration to its JSON file and the shared in-memory copy."""
     try:
         os.makedirs(CONFIG_DIR, exist_ok=True)
         with open(POLLING_CONFIG_FILE, 'w') as f:
             json.dump(config, f, indent=4)
+        with _polling_config_lock:
+            _polling_config.update(loaded=True, data=copy.deepcopy(config))
         return True, None
     except IOError as e:
         return False, str(e)
@@ -169,7 +394,8 @@ def index():
 @app.route('/bucket/<bucket_name>')
 def view_bucket(bucket_name):
     prefix = request.args.get('prefix', '')
-    folders, files, error = s3_utils.list_objects(bucket_name, prefix)
+    token = request.args.get('token')
+    folders, files, next_token, error = s3_utils.list_objects(bucket_name, prefix, token)
     if error:
         return render_template('error.html', error_message=error)
 
@@ -184,7 +410,12 @@ def view_bucket(bucket_name):
 
     return render_template('bucket.html', 
                            bucket_name=bucket_name, prefix=prefix,
-                           folders=folders, files=files, breadcrumbs=breadcrumbs)
+                           folders=folders, files=files, breadcrumbs=breadcrumbs,
+                           token=token, next_token=next_token)
+
+# Path components rejected in uploaded file names
+_INVALID_PATH_PARTS = frozenset(('', '.', '..'))
+_BACKSLASH_TO_SLASH = str.maketrans({'\\': '/'})
 
 @app.route('/upload/<bucket_name>', methods=['POST'])
 def upload(bucket_name):
@@ -217,19 +448,8 @@ def upload(bucket_name):
             continue
             
         # --- ROBUST PATH CLEANING ---
-        normalized_path = original_path.replace("\\", "/")
-        parts = normalized_path.split('/')
-        clean_parts = []
-        is_path_valid = True
-        
-        for part in parts:
-            clean_part = part.strip()
-            if not clean_part or clean_part == '.' or clean_part == '..':
-                is_path_valid = False
-                break
-            clean_parts.append(clean_part)
-            
-        if not is_path_valid or not clean_parts:
+        clean_parts = [part.strip() for part in original_path.translate(_BACKSLASH_TO_SLASH).split('/')]
+        if any(part in _INVALID_PATH_PARTS for part in clean_parts):
             error_messages.append(f"Skipped file with invalid path: '{original_path}'")
             app.logger.warning(f"Skipped file with invalid path: '{original_path}'")
             continue
@@ -255,13 +475,35 @@ def upload(bucket_name):
     return redirect(url_for('view_bucket', bucket_name=bucket_name, prefix=prefix))
 
 
+def _attachment_filenames(download_name):
+    """Content-Disposition filename parameters, with an RFC 5987 form for non-ASCII names."""
+    try:
+        download_name.encode('ascii')
+    except UnicodeEncodeError:
+        simple = unicodedata.normalize('NFKD', download_name).encode('ascii', 'ignore').decode('ascii')
+        return {'filename': simple, 'filename*': f"UTF-8''{quote(download_name, safe='')}"}
+    return {'filename': download_name}
+
 @app.route('/download/<bucket_name>/<path:object_name>')
 def download(bucket_name, object_name):
-    file_obj, error = s3_utils.download_file(bucket_name, object_name)
+    s3_object, error = s3_utils.download_file(bucket_name, object_name)
     if error:
         return render_template('error.html', error_message=error)
     download_name = object_name.split('/')[-1]
-    return send_file(file_obj, as_attachment=True, download_name=download_name)
+    body = s3_object['Body']
+
+    def generate():
+        try:
+            for chunk in body.iter_chunks(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                yield chunk
+        finally:
+            body.close()
+
+    response = Response(stream_with_context(generate()),
+                        content_type=s3_object.get('ContentType') or 'application/octet-stream')
+    response.headers['Content-Length'] = str(s3_object['ContentLength'])
+    response.headers.set('Content-Disposition', 'attachment', **_attachment_filenames(download_name))
+    return response
 
 @app.route('/delete_selected/<bucket_name>', methods=['POST'])
 def delete_selected(bucket_name):
@@ -273,8 +515,9 @@ def delete_selected(bucket_name):
     for item_key in items_to_delete:
         if item_key.endswith('/'):
             count, error = s3_utils.delete_folder(bucket_name, item_key)
+            # Part of a folder may be deleted even when some batches fail
+            deleted_count += count
             if error: error_messages.append(f"Failed to delete folder '{item_key}': {error}")
-            else: deleted_count += count
         else:
             success, error = s3_utils.delete_object(bucket_name, item_key)
             if error: error_messages.append(f"Failed to delete file '{item_key}': {error}")
@@ -345,6 +588,7 @@ def configure():
             os.makedirs(CONFIG_DIR, exist_ok=True)
             with open(S3_CONFIG_FILE, 'w') as f:
                 json.dump(new_config, f, indent=4)
+            s3_utils.invalidate_s3_client()
             flash('Configuration saved. The application will now use the new settings.', 'info')
             return redirect(url_for('configure'))
         except IOError as e:
@@ -362,7 +606,7 @@ def configure():
     current_config.setdefault('S3_ENDPOINT_URL', os.getenv('S3_ENDPOINT_URL', ''))
     current_config.setdefault('S3_ACCESS_KEY', os.getenv('S3_ACCESS_KEY', ''))
     
-    _, error = s3_utils.get_s3_client()
+    error = s3_utils.check_connection()
     connection_status = "Successfully Connected" if not error else "Connection Failed"
     
     return render_template('configure.html',
@@ -376,5 +620,8 @@ if __name__ == '__main__':
     
     poller_thread = threading.Thread(target=poller_background_thread, name="PollingThread", daemon=True)
     poller_thread.start()
+
+    for i, work_queue in enumerate(notification_queues):
+        threading.Thread(target=notification_worker, args=(work_queue,), name=f"WebhookSender-{i}", daemon=True).start()
     
     app.run(host='0.0.0.0', port=5001)
\ No newline at end of file
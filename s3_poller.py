@@ -1,11 +1,16 @@
 import os
 import time
 import json
+import hashlib
+import sys
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import boto3
 from botocore.client import Config
-from botocore.exceptions import ClientError
+from botocore.exceptions import BotoCoreError, ClientError
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 # --- Configuration Files ---
 # Shared with the Flask app
@@ -13,8 +18,25 @@ S3_CONFIG_FILE = '/tmp/s3_config.json'
 # Specific to the poller
 POLLING_CONFIG_FILE = '/tmp/polling_config.json'
 
+# --- Parallel Listing ---
+MAX_POOL_CONNECTIONS = 8 # One per listing shard; buckets are scanned one at a time
+# Large buckets are listed in parallel key ranges split at keys from the previous scan
+LIST_KEYS_PER_SHARD = 5000 # Target keys per range (5 pages)
+MAX_LIST_SHARDS = 8
+executor = ThreadPoolExecutor(max_workers=MAX_POOL_CONNECTIONS)
+
+# --- Webhook Delivery ---
+# One pooled session so notifications reuse TCP/TLS connections
+_webhook_session = requests.Session()
+_webhook_adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32,
+                               max_retries=Retry(total=2, backoff_factor=0.2))
+_webhook_session.mount('http://', _webhook_adapter)
+_webhook_session.mount('https://', _webhook_adapter)
+
 # --- Logging Setup ---
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - [Poller] - %(levelname)s - %(message)s')
+logging.getLogger('botocore').setLevel(logging.WARNING)
+logging.getLogger('urllib3').setLevel(logging.WARNING)
 
 def get_s3_client():
     """Initializes S3 client using the shared config file."""
@@ -45,7 +67,8 @@ def get_s3_client():
             aws_access_key_id=s3_access_key,
             aws_secret_access_key=s3_secret_key,
             region_name=s3_region,
-            config=Config(signature_version='s3v4', retries={'max_attempts': 2})
+            config=Config(signature_version='s3v4', retries={'max_attempts': 2},
+                          max_pool_connections=MAX_POOL_CONNECTIONS)
         )
         s3_client.list_buckets()
         logging.info("✅ Successfully connected to S3 endpoint.")
@@ -54,19 +77,84 @@ def get_s3_client():
         logging.error(f"❌ Could not connect to S3. Error: {e}")
         return None
 
-def get_bucket_state(s3_client, bucket_name):
-    """Scans a bucket and returns a dictionary of {object_key: ETag}."""
-    state = {}
+def _list_key_range(s3_client, bucket_name, start_after, end_at):
+    """Lists (key, ETag) pairs with start_after < key <= end_at; end_at=None is unbounded."""
+    entries = []
+    paginator = s3_client.get_paginator('list_objects_v2')
+    for page in paginator.paginate(Bucket=bucket_name, StartAfter=start_after):
+        for obj in page.get('Contents', []):
+            if end_at is not None and obj['Key'] > end_at:
+                return entries
+            entries.append((obj['Key'], obj['ETag']))
+    return entries
+
+def _etag_fingerprint(etag):
+    return int.from_bytes(hashlib.blake2b(etag.encode(), digest_size=8).digest(), 'little')
+
+def shard_split_points(state):
+    """Picks evenly spaced keys from a known bucket state as split points for its next scan.
+
+    The state is built in listing order, so its keys are already sorted.
+    """
+    shards = min(MAX_LIST_SHARDS, len(state) // LIST_KEYS_PER_SHARD)
+    if shards < 2:
+        return []
+    keys = list(state)
+    step = len(keys) // shards
+    return [keys[i * step] for i in range(1, shards)]
+
+def get_bucket_state(s3_client, bucket_name, known_digest=None, split_points=()):
+    """Scans a bucket and returns ({object_key: ETag fingerprint}, digest).
+
+    split_points are sorted keys used to list a large bucket in parallel ranges.
+    The digest is a hash over every (key, ETag) pair. If it equals known_digest,
+    the bucket is unchanged and (None, digest) is returned without building the
+    dictionary. On a listing error, (None, None) is returned.
+    """
     try:
-        paginator = s3_client.get_paginator('list_objects_v2')
-        pages = paginator.paginate(Bucket=bucket_name)
-        for page in pages:
-            if 'Contents' in page:
-                for obj in page['Contents']:
-                    state[obj['Key']] = obj['ETag']
-    except ClientError as e:
+        first_page = s3_client.list_objects_v2(Bucket=bucket_name)
+        chunks = [[(obj['Key'], obj['ETag']) for obj in first_page.get('Contents', [])]]
+
+        # Small buckets fit in one page. For larger ones, split the remaining
+        # key space at split_points (keys from the previous scan, see
+        # shard_split_points) into disjoint ranges and list them in parallel.
+        if first_page.get('IsTruncated'):
+            last_key = chunks[0][-1][0]
+            bounds = [last_key] + [k for k in split_points if k > last_key] + [None]
+            futures = [
+                executor.submit(_list_key_range, s3_client, bucket_name, start, end)
+                for start, end in zip(bounds, bounds[1:])
+            ]
+            chunks.extend(future.result() for future in futures)
+    except (ClientError, BotoCoreError) as e:
         logging.error(f"Error listing objects in bucket '{bucket_name}': {e}")
-    return state
+        return None, None
+
+    h = hashlib.blake2b(digest_size=16)
+    for chunk in chunks:
+        for key, etag in chunk:
+            h.update(key.encode())
+            h.update(b'\0')
+            h.update(etag.encode())
+            h.update(b'\n')
+    digest = h.digest()
+    if digest == known_digest:
+        return None, digest
+
+    # Keys are interned so consecutive states share key objects, and ETags are
+    # stored as 64-bit ints rather than ~35-char strings.
+    state = {}
+    for chunk in chunks:
+        for key, etag in chunk:
+            state[sys.intern(key)] = _etag_fingerprint(etag)
+    return state, digest
+
+def diff_states(previous_state, current_state):
+    """Returns (created_or_modified, deleted) key lists between two bucket states."""
+    cur_keys = current_state.keys()
+    prev_keys = previous_state.keys()
+    modified = {k for k in cur_keys & prev_keys if current_state[k] != previous_state[k]}
+    return sorted((cur_keys - prev_keys) | modified), sorted(prev_keys - cur_keys)
 
 def send_notification(webhook_url, event_type, bucket_name, object_key):
     """Sends a notification payload to the configured webhook URL."""
@@ -77,7 +165,7 @@ def send_notification(webhook_url, event_type, bucket_name, object_key):
         'timestamp': time.time()
     }
     try:
-        response = requests.post(webhook_url, json=payload, timeout=10)
+        response = _webhook_session.post(webhook_url, json=payload, timeout=10)
         response.raise_for_status()
         logging.info(f"🚀 Sent notification for {event_type}: {object_key} to {webhook_url}")
     except requests.exceptions.RequestException as e:
@@ -86,7 +174,10 @@ def send_notification(webhook_url, event_type, bucket_name, object_key):
 def main_polling_loop():
     """The main loop that polls all configured buckets."""
     s3_client = None
-    known_states = {} # e.g., {'bucket-one': {'file1.txt': 'etag...'}, 'bucket-two': {}}
+    known_states = {} # e.g., {'bucket-one': {'file1.txt': <etag fingerprint>}, 'bucket-two': {}}
+    known_hashes = {} # Digest of each bucket's (key, ETag) pairs from the last scan
+    known_splits = {} # Split points for listing each large bucket in parallel
+    cfg_cache = {"mtime_ns": -1, "data": {}}
     
     # Wait for the initial S3 configuration to be created by the web UI
     while s3_client is None:
@@ -98,17 +189,25 @@ def main_polling_loop():
     while True:
         try:
             # Load the polling configuration on each iteration to get updates from the UI
-            if not os.path.exists(POLLING_CONFIG_FILE):
+            try:
+                st = os.stat(POLLING_CONFIG_FILE)
+            except FileNotFoundError:
                 time.sleep(10)
                 continue
-            
-            with open(POLLING_CONFIG_FILE, 'r') as f:
-                polling_config = json.load(f)
+
+            # Re-parse the config only when the file has been rewritten
+            if st.st_mtime_ns != cfg_cache["mtime_ns"]:
+                with open(POLLING_CONFIG_FILE, 'r') as f:
+                    cfg_cache["data"] = json.load(f)
+                cfg_cache["mtime_ns"] = st.st_mtime_ns
+            polling_config = cfg_cache["data"]
 
             for bucket_name, config in polling_config.items():
                 if not config.get('enabled'):
                     if bucket_name in known_states:
                         del known_states[bucket_name] # Remove disabled buckets from tracking
+                        known_hashes.pop(bucket_name, None)
+                        known_splits.pop(bucket_name, None)
                     continue
 
                 webhook_url = config['webhook_url']
@@ -116,25 +215,35 @@ def main_polling_loop():
                 
                 # If we see a new bucket, initialize its state
                 if bucket_name not in known_states:
-                    known_states[bucket_name] = get_bucket_state(s3_client, bucket_name)
-                    logging.info(f"Now monitoring bucket '{bucket_name}'. Initial state has {len(known_states[bucket_name])} objects.")
+                    state, digest = get_bucket_state(s3_client, bucket_name)
+                    if state is None:
+                        continue # Listing failed; retry on the next cycle
+                    known_states[bucket_name] = state
+                    known_hashes[bucket_name] = digest
+                    known_splits[bucket_name] = shard_split_points(state)
+                    logging.info(f"Now monitoring bucket '{bucket_name}'. Initial state has {len(state)} objects.")
                     continue # Start comparisons on the next cycle
 
-                current_state = get_bucket_state(s3_client, bucket_name)
+                # Skip the diff entirely when the bucket's digest is unchanged
+                current_state, digest = get_bucket_state(s3_client, bucket_name, known_hashes[bucket_name],
+                                                       known_splits.get(bucket_name, ()))
+                if current_state is None:
+                    continue
                 previous_state = known_states[bucket_name]
 
                 # --- Detect Changes ---
-                for key, etag in current_state.items():
-                    if key not in previous_state or previous_state[key] != etag:
-                        logging.info(f"Change detected in '{bucket_name}': {key} was created or modified.")
-                        send_notification(webhook_url, 'OBJECT_CREATED', bucket_name, key)
-
-                for key in previous_state:
-                    if key not in current_state:
-                        logging.info(f"Change detected in '{bucket_name}': {key} was deleted.")
-                        send_notification(webhook_url, 'OBJECT_DELETED', bucket_name, key)
+                created, deleted = diff_states(previous_state, current_state)
+                for key in created:
+                    logging.info(f"Change detected in '{bucket_name}': {key} was created or modified.")
+                    send_notification(webhook_url, 'OBJECT_CREATED', bucket_name, key)
+
+                for key in deleted:
+                    logging.info(f"Change detected in '{bucket_name}': {key} was deleted.")
+                    send_notification(webhook_url, 'OBJECT_DELETED', bucket_name, key)
                 
                 known_states[bucket_name] = current_state
+                known_hashes[bucket_name] = digest
+                known_splits[bucket_name] = shard_split_points(current_state)
             
             # Use a general poll interval after checking all buckets
             # A more advanced version could have per-bucket sleep times
@@ -1,15 +1,86 @@
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.client import Config
-from botocore.exceptions import NoCredentialsError, ClientError, EndpointConnectionError
+from botocore.exceptions import NoCredentialsError, ClientError, EndpointConnectionError, BotoCoreError
+from botocore.parsers import ResponseParserError
 import logging
 import os
 import json
+import threading
+import functools
+import mimetypes
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 CONFIG_FILE_PATH = '/data/config/s3_config.json'
-#boto3.set_stream_logger('botocore', level='DEBUG')
+EXECUTOR_WORKERS = 16
+# Connections for threads outside the executor that call S3 directly: Flask
+# request handlers, the poller's bucket scans (app.BUCKET_SCAN_WORKERS) and
+# their key-range shards (app.LIST_SHARD_WORKERS).
+CALLER_CONNECTIONS = 32
+MAX_POOL_CONNECTIONS = EXECUTOR_WORKERS + CALLER_CONNECTIONS
+MB = 1024 * 1024
+LIST_PAGE_SIZE = 1000 # Keys per page in the bucket browser
+LIST_CACHE_TTL = 15 # Seconds a listing page is served from cache
+LIST_CACHE_SIZE = 1024 # Max cached listing pages
+PROBE_TTL = 30 # Seconds a connection check result is reused
+# A bucket name that almost certainly doesn't exist; HeadBucket on it answers 404 when auth works
+PROBE_BUCKET = f's3ui-probe-{uuid.uuid4().hex}'
+
+mimetypes.init()
+
+# Uploads above the threshold go as parallel multipart PUTs
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * MB,
+    multipart_chunksize=8 * MB,
+    max_concurrency=8,
+    use_threads=True
+)
+
+# botocore and urllib3 log several INFO records per API call; keep them quiet
+# unless S3UI_BOTO_DEBUG is set.
+if os.getenv('S3UI_BOTO_DEBUG'):
+    boto3.set_stream_logger('botocore', level='DEBUG')
+else:
+    logging.getLogger('botocore').setLevel(logging.WARNING)
+    logging.getLogger('urllib3').setLevel(logging.WARNING)
+
+# Cached client, built from the config file on first use and rebuilt after invalidate_s3_client().
+_client_cache = {"loaded": False, "client": None, "error": None}
+_client_lock = threading.Lock()
+_probe_cache = {"client": None, "checked_at": 0.0, "error": None}
+_probe_lock = threading.Lock()
+# LRU of listing pages: (bucket, prefix, continuation_token) -> (expires_at, folders, files, next_token)
+_list_cache = OrderedDict()
+_list_lock = threading.Lock()
+# If-None-Match value for the ListObjectsV2 call in progress on this thread
+_conditional_list = threading.local()
+
+# Shared pool for fanning out S3 calls; every worker has its own client connection.
+executor = ThreadPoolExecutor(max_workers=EXECUTOR_WORKERS, thread_name_prefix='S3Worker')
+
+def invalidate_s3_client():
+    """Forces the next get_s3_client() call to rebuild the client."""
+    with _client_lock:
+        _client_cache["loaded"] = False
+        _client_cache["client"] = None
+        _client_cache["error"] = None
+    with _probe_lock:
+        _probe_cache["client"] = None
+    with _list_lock:
+        _list_cache.clear()
 
 def get_s3_client():
-# ... existing code ...
+    with _client_lock:
+        if _client_cache["loaded"]:
+            return _client_cache["client"], _client_cache["error"]
+        client, error = _build_s3_client()
+        _client_cache.update(loaded=True, client=client, error=error)
+        return client, error
+
+def _build_s3_client():
     config = {}
     # Try to load from config file first
     if os.path.exists(CONFIG_FILE_PATH):
@@ -22,7 +93,6 @@ def get_s3_client():
             pass # Ignore errors and fall back
 
     s3_endpoint_url = config.get('S3_ENDPOINT_URL') or os.getenv('S3_ENDPOINT_URL') or 'http://localhost:19000'
-# ... existing code ...
     s3_access_key = config.get('S3_ACCESS_KEY') or os.getenv('S3_ACCESS_KEY') or 'anykey'
     s3_secret_key = config.get('S3_SECRET_KEY') or os.getenv('S3_SECRET_KEY') or 'anysecret'
     s3_region = config.get('S3_REGION') or os.getenv('S3_REGION') or 'us-east-1'
@@ -30,8 +100,9 @@ def get_s3_client():
     if not all([s3_endpoint_url, s3_access_key, s3_secret_key]):
         return None, "S3 connection details could not be determined."
 
+    # No validation round-trip here: auth and connection problems surface
+    # through the ClientError handling in each wrapper below.
     try:
-# ... existing code ...
         s3_client = boto3.client(
             's3',
             endpoint_url=s3_endpoint_url,
@@ -42,21 +113,75 @@ def get_s3_client():
                 s3={'addressing_style': 'path'},
                 signature_version='s3v4',
                 connect_timeout=5,
-                retries={'max_attempts': 1}
+                retries={'max_attempts': 1},
+                max_pool_connections=MAX_POOL_CONNECTIONS
             )
         )
-        s3_client.list_buckets()
+        s3_client.meta.events.register('before-call.s3.ListObjectsV2', _add_if_none_match)
         return s3_client, None
+    except Exception as e:
+        return None, f"An unexpected error occurred: {e}"
+
+def _add_if_none_match(params, **kwargs):
+    etag = getattr(_conditional_list, 'etag', None)
+    if etag:
+        params['headers']['If-None-Match'] = etag
+
+def list_objects_v2_if_changed(s3_client, etag, **kwargs):
+    """Calls ListObjectsV2, sending If-None-Match when an etag is given.
+
+    Returns None if the backend answers 304 Not Modified. Backends that ignore
+    the header simply return the listing.
+    """
+    _conditional_list.etag = etag
+    try:
+        return s3_client.list_objects_v2(**kwargs)
+    except ClientError as e:
+        if e.response.get('ResponseMetadata', {}).get('HTTPStatusCode') == 304: return None
+        if e.response.get('Error', {}).get('Code') in ('304', 'NotModified'): return None
+        raise
+    finally:
+        _conditional_list.etag = None
+
+def probe_s3_client(s3_client):
+    """Checks connectivity and credentials with a HeadBucket on a missing bucket.
+
+    Returns None when the endpoint answers 404 (reachable, credentials accepted),
+    otherwise an error message.
+    """
+    try:
+        s3_client.head_bucket(Bucket=PROBE_BUCKET)
+        return None
     except EndpointConnectionError:
-        return None, f"Could not connect to endpoint: {s3_endpoint_url}"
+        return f"Could not connect to endpoint: {s3_client.meta.endpoint_url}"
     except ClientError as e:
-# ... existing code ...
+        # HEAD responses have no body, so botocore only reports the HTTP status as the code
         error_code = e.response['Error']['Code']
-        if error_code == 'InvalidAccessKeyId': return None, "The Access Key ID is invalid."
-        if error_code == 'SignatureDoesNotMatch': return None, "The Secret Access Key is incorrect."
-        return None, f"An S3 client error occurred: {error_code}"
+        if error_code == '404': return None
+        if error_code == '403': return "Access denied. The Access Key ID or Secret Access Key is incorrect."
+        if error_code == '400': return "The endpoint rejected the request. Check the region and endpoint URL."
+        return f"An S3 client error occurred: {error_code}"
     except Exception as e:
-        return None, f"An unexpected error occurred: {e}"
+        return f"An unexpected error occurred: {e}"
+
+def check_connection():
+    """Returns None if S3 is reachable with the current settings, else an error message.
+
+    Results are cached for PROBE_TTL seconds per client.
+    """
+    s3, error = get_s3_client()
+    if error: return error
+    with _probe_lock:
+        if _probe_cache["client"] is s3 and time.time() - _probe_cache["checked_at"] < PROBE_TTL:
+            return _probe_cache["error"]
+    error = probe_s3_client(s3)
+    with _probe_lock:
+        _probe_cache.update(client=s3, checked_at=time.time(), error=error)
+    return error
+
+@functools.lru_cache(maxsize=1024)
+def _guess_ct(ext):
+    return mimetypes.types_map.get(ext, 'application/octet-stream')
 
 def list_buckets():
 # ... existing code ...
@@ -65,26 +190,50 @@ def list_buckets():
     try:
         response = s3.list_buckets()
         return [bucket['Name'] for bucket in response['Buckets']], None
-    except ClientError as e:
+    except (ClientError, BotoCoreError, ResponseParserError) as e:
         return None, f"Could not list buckets. Error: {e}"
 
-def list_objects(bucket_name, prefix=''):
-# ... existing code ...
+def _invalidate_listings(bucket_name):
+    """Drops every cached listing for a bucket after its contents change."""
+    with _list_lock:
+        for cache_key in [k for k in _list_cache if k[0] == bucket_name]:
+            del _list_cache[cache_key]
+
+def list_objects(bucket_name, prefix='', continuation_token=None):
+    """Lists one page of folders and files under a prefix.
+
+    Returns (folders, files, next_token, error); next_token is None on the last page.
+    Results are cached for LIST_CACHE_TTL seconds.
+    """
+    cache_key = (bucket_name, prefix, continuation_token)
+    with _list_lock:
+        cached = _list_cache.get(cache_key)
+        if cached and cached[0] > time.time():
+            _list_cache.move_to_end(cache_key)
+            _, folders, files, next_token = cached
+            return list(folders), list(files), next_token, None
+
     s3, error = get_s3_client()
-    if error: return None, None, error
+    if error: return None, None, None, error
     folders, files = [], []
     try:
-        paginator = s3.get_paginator('list_objects_v2')
-        pages = paginator.paginate(Bucket=bucket_name, Prefix=prefix, Delimiter='/')
-        for page in pages:
-            if 'CommonPrefixes' in page:
-                for p in page['CommonPrefixes']: folders.append(p['Prefix'])
-            if 'Contents' in page:
-                for obj in page['Contents']:
-                    if obj['Key'] != prefix: files.append(obj)
-        return folders, files, None
-    except ClientError as e:
-        return None, None, f"Could not list objects. Error: {e}"
+        kwargs = {'Bucket': bucket_name, 'Prefix': prefix, 'Delimiter': '/', 'MaxKeys': LIST_PAGE_SIZE}
+        if continuation_token:
+            kwargs['ContinuationToken'] = continuation_token
+        page = s3.list_objects_v2(**kwargs)
+        for p in page.get('CommonPrefixes', []): folders.append(p['Prefix'])
+        for obj in page.get('Contents', []):
+            if obj['Key'] != prefix: files.append(obj)
+        next_token = page.get('NextContinuationToken') if page.get('IsTruncated') else None
+    except (ClientError, BotoCoreError, ResponseParserError) as e:
+        return None, None, None, f"Could not list objects. Error: {e}"
+
+    with _list_lock:
+        _list_cache[cache_key] = (time.time() + LIST_CACHE_TTL, folders, files, next_token)
+        _list_cache.move_to_end(cache_key)
+        while len(_list_cache) > LIST_CACHE_SIZE:
+            _list_cache.popitem(last=False)
+    return list(folders), list(files), next_token, None
 
 def upload_file(file_obj, bucket_name, object_name=None, content_type=None):
     s3, error = get_s3_client()
@@ -96,8 +245,8 @@ def upload_file(file_obj, bucket_name, object_name=None, content_type=None):
     if content_type:
         extra_args['ContentType'] = content_type
     else:
-        # Default if browser doesn't provide one
-        extra_args['ContentType'] = 'application/octet-stream'
+        # Guess from the extension if browser doesn't provide one
+        extra_args['ContentType'] = _guess_ct(os.path.splitext(object_name)[1].lower())
     # --- END OF CHANGE ---
 
     try:
@@ -105,10 +254,12 @@ def upload_file(file_obj, bucket_name, object_name=None, content_type=None):
             file_obj, 
             bucket_name, 
             object_name,
-            ExtraArgs=extra_args # Pass the args to S3
+            ExtraArgs=extra_args, # Pass the args to S3
+            Config=TRANSFER_CONFIG
         )
+        _invalidate_listings(bucket_name)
         return True, None
-    except ClientError as e:
+    except (ClientError, BotoCoreError, ResponseParserError) as e:
         return False, f"Could not upload file. Error: {e}"
 
 def download_file(bucket_name, object_name):
@@ -116,9 +267,8 @@ def download_file(bucket_name, object_name):
     s3, error = get_s3_client()
     if error: return None, error
     try:
-        file_obj = s3.get_object(Bucket=bucket_name, Key=object_name)
-        return file_obj['Body'], None
-    except ClientError as e:
+        return s3.get_object(Bucket=bucket_name, Key=object_name), None
+    except (ClientError, BotoCoreError, ResponseParserError) as e:
         return None, f"Could not download file. Error: {e}"
 
 def delete_object(bucket_name, object_key):
@@ -127,8 +277,9 @@ def delete_object(bucket_name, object_key):
     if error: return False, error
     try:
         s3.delete_object(Bucket=bucket_name, Key=object_key)
+        _invalidate_listings(bucket_name)
         return True, None
-    except ClientError as e:
+    except (ClientError, BotoCoreError, ResponseParserError) as e:
         return False, f"Could not delete object. Error: {e}"
 
 def delete_folder(bucket_name, prefix):
@@ -136,28 +287,42 @@ def delete_folder(bucket_name, prefix):
     s3, error = get_s3_client()
     if error: return 0, error
     
-    objects_to_delete = []
+    batches = [] # (future, number of keys in the batch)
+    error = None
     try:
         paginator = s3.get_paginator('list_objects_v2')
         pages = paginator.paginate(Bucket=bucket_name, Prefix=prefix)
         for page in pages:
-            if 'Contents' in page:
-                for obj in page['Contents']:
-                    objects_to_delete.append({'Key': obj['Key']})
-        
-        if not objects_to_delete:
-            return 0, None
-
-        for i in range(0, len(objects_to_delete), 1000):
-# ... existing code ...
-            s3.delete_objects(
-                Bucket=bucket_name,
-                Delete={'Objects': objects_to_delete[i:i+1000], 'Quiet': True}
-            )
-        
-        return len(objects_to_delete), None
-    except ClientError as e:
-        return 0, f"Could not delete folder contents. Error: {e}"
+            # Each page holds at most 1000 keys, the DeleteObjects limit, so it
+            # is deleted as one batch while the next page is being listed.
+            objects_to_delete = [{'Key': obj['Key']} for obj in page.get('Contents', [])]
+            if objects_to_delete:
+                batches.append((executor.submit(
+                    s3.delete_objects,
+                    Bucket=bucket_name,
+                    Delete={'Objects': objects_to_delete, 'Quiet': True}
+                ), len(objects_to_delete)))
+    except (ClientError, BotoCoreError, ResponseParserError) as e:
+        error = f"Could not delete folder contents. Error: {e}"
+
+    # Every submitted batch is waited on, even after a listing error, so the
+    # count is exact and the listing cache is cleared only once all have landed.
+    deleted_count = 0
+    failed_count = 0
+    for future, size in batches:
+        try:
+            failed = future.result().get('Errors', [])
+        except (ClientError, BotoCoreError, ResponseParserError) as e:
+            error = error or f"Could not delete folder contents. Error: {e}"
+            continue
+        deleted_count += size - len(failed)
+        if failed:
+            failed_count += len(failed)
+            error = error or f"Could not delete '{failed[0]['Key']}'. Error: {failed[0].get('Message')}"
+    if failed_count > 1:
+        error += f" ({failed_count} objects failed)"
+    _invalidate_listings(bucket_name)
+    return deleted_count, error
 
 def delete_bucket(bucket_name):
 # ... existing code ...
@@ -165,7 +330,10 @@ def delete_bucket(bucket_name):
     if error: return False, error
     try:
         s3.delete_bucket(Bucket=bucket_name)
+        _invalidate_listings(bucket_name)
         return True, None
+    except (BotoCoreError, ResponseParserError) as e:
+        return False, f"Could not delete bucket. Error: {e}"
     except ClientError as e:
         if e.response['Error']['Code'] == 'BucketNotEmpty':
             return False, "Bucket is not empty and cannot be deleted. Please delete all contents first."
@@ -178,5 +346,5 @@ def create_bucket(bucket_name):
     try:
         s3.create_bucket(Bucket=bucket_name)
         return True, None
-    except ClientError as e:
+    except (ClientError, BotoCoreError, ResponseParserError) as e:
         return False, f"Could not create bucket. Error: {e}"